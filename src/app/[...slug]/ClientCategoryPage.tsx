@@ -4,6 +4,7 @@
 import { useState, useMemo } from 'react'
 import Image from 'next/image'
 import Link from 'next/link'
+import { useRouter } from 'next/navigation'
 import { dataService } from '@/lib/dataService' // Только клиентские вызовы, но здесь не нужны - данные пропсами
 import { ImageService } from '@/lib/imageService'
 import ProductFilter from '@/components/ProductFilter'
@@ -24,41 +25,41 @@ interface ClientCategoryPageProps {
     initialData: {
         category: { title: string; description?: string }
         products: Product[]
+        sortKey: string
+        page: number
+        pages: number
+        total: number
         markdown: string
         filterConfig: AutoFilterConfig
+        thumbnails: Record<string, string[]>
     }
     slug: string
 }
 
+// Адрес страницы категории; сортировка и номер страницы по умолчанию в адрес не попадают
+function categoryHref(slug: string, sortKey: string, page: number): string {
+    const query = new URLSearchParams()
+    if (sortKey !== SORTOPTIONS.DEFAULT) query.set('sort', sortKey)
+    if (page > 1) query.set('page', String(page))
+    const search = query.toString()
+    return search ? `/${slug}?${search}` : `/${slug}`
+}
+
 export default function ClientCategoryPage({ initialData, slug }: ClientCategoryPageProps) {
-    const { category, products: categoryProducts, markdown: markdownContent, filterConfig } = initialData
+    const { category, products: pageProducts, sortKey, page, pages, markdown: markdownContent, filterConfig, thumbnails } = initialData
+    const router = useRouter()
     const [activeFilters, setActiveFilters] = useState<ActiveFilters>({})
-    const [sortKey, setSortKey] = useState<SortKeyType>('default')
-
-    const filteredProducts = useMemo(() => {
-        if (Object.keys(activeFilters).length === 0) {
-            return categoryProducts
-        }
-        // Клиентский вызов, если нужно динамично; но для SSG лучше предфильтровать, если фильтры статичны
-        return dataService.getFilteredProducts(slug, activeFilters) // Но dataService 'use server' - ошибка! Фикс: имплементировать клиентскую фильтрацию или Suspense
-        // Альтернатива: перенести filterLogic на клиент, использовать categoryProducts как базу
-    }, [categoryProducts, activeFilters, slug])
+    const hasFilters = Object.keys(activeFilters).length > 0
 
+    // Сортировка и страница берутся с сервера готовыми срезами: смена - переход по адресу
     const sortedProducts = useMemo(() => {
-        const arr = [...filteredProducts]
-        switch (sortKey) {
-            case SORTOPTIONS.PRICEASC:
-                return arr.sort((a, b) => (Number(a.price ?? 0) - Number(b.price ?? 0)))
-            case SORTOPTIONS.PRICEDESC:
-                return arr.sort((a, b) => (Number(b.price ?? 0) - Number(a.price ?? 0)))
-            case SORTOPTIONS.NAMEASC:
-                return arr.sort((a, b) => a.title.localeCompare(b.title, 'ru'))
-            case SORTOPTIONS.NAMEDESC:
-                return arr.sort((a, b) => b.title.localeCompare(a.title, 'ru'))
-            default:
-                return arr // Или предсортировка по популярности/цене
+        if (!hasFilters) {
+            return pageProducts
         }
-    }, [filteredProducts, sortKey])
+        // Клиентский вызов, если нужно динамично; но для SSG лучше предфильтровать, если фильтры статичны
+        // Результат приходит уже упорядоченным по текущей сортировке
+        return dataService.getFilteredProducts(slug, activeFilters, sortKey) // Но dataService 'use server' - ошибка! Фикс: имплементировать клиентскую фильтрацию или Suspense
+    }, [pageProducts, hasFilters, activeFilters, sortKey, slug])
 
     return (
         <div className="container">
@@ -78,7 +79,7 @@ export default function ClientCategoryPage({ initialData, slug }: ClientCategory
                         <label className="label">Сортировка</label>
                         <div className="control">
                             <div className="select">
-                                <select value={sortKey} onChange={e => setSortKey(e.target.value as SortKeyType)}>
+                                <select value={sortKey} onChange={e => router.push(categoryHref(slug, e.target.value as SortKeyType, 1))}>
                                     <option value={SORTOPTIONS.DEFAULT}>По умолчанию</option>
                                     <option value={SORTOPTIONS.PRICEASC}>Цена ↑</option>
                                     <option value={SORTOPTIONS.PRICEDESC}>Цена ↓</option>
@@ -101,7 +102,7 @@ export default function ClientCategoryPage({ initialData, slug }: ClientCategory
                 <div className="column">
                     {sortedProducts.length === 0 ? ( // Изменил на sorted
                         <div className="notification is-warning">
-                            {Object.keys(activeFilters).length > 0
+                            {hasFilters
                                 ? 'По выбранным фильтрам товаров не найдено'
                                 : 'В этой категории пока нет товаров'
                             }
@@ -109,7 +110,8 @@ export default function ClientCategoryPage({ initialData, slug }: ClientCategory
                     ) : (
                         <div className="columns is-multiline">
                             {sortedProducts.map(product => { // sorted
-                                const thumbnails = ImageService.getProductThumbnails(product, slug) // ImageService 'use server' - ошибка!
+                                // Миниатюры страницы посчитаны на сервере, для результатов фильтрации - как раньше
+                                const productThumbnails = thumbnails[product.id] ?? ImageService.getProductThumbnails(product, slug) // ImageService 'use server' - ошибка!
 
                                 return (
                                     <div key={product.id} className="column is-one-third">
@@ -122,10 +124,10 @@ export default function ClientCategoryPage({ initialData, slug }: ClientCategory
                                                         size="small"
                                                     />
                                                 </div>
-                                                {thumbnails.length > 0 && (
+                                                {productThumbnails.length > 0 && (
                                                     <figure className="image is-4by3">
                                                         <Image
-                                                            src={thumbnails[0]}
+                                                            src={productThumbnails[0]}
                                                             alt={product.title}
                                                             width={400}
                                                             height={300}
@@ -167,6 +169,40 @@ export default function ClientCategoryPage({ initialData, slug }: ClientCategory
                             })}
                         </div>
                     )}
+
+                    {!hasFilters && pages > 1 && (
+                        <nav className="pagination is-centered mt-5" role="navigation" aria-label="pagination">
+                            <Link
+                                href={categoryHref(slug, sortKey, page - 1)}
+                                className="pagination-previous"
+                                aria-disabled={page <= 1}
+                                style={page <= 1 ? { pointerEvents: 'none', opacity: 0.5 } : undefined}
+                            >
+                                Назад
+                            </Link>
+                            <Link
+                                href={categoryHref(slug, sortKey, page + 1)}
+                                className="pagination-next"
+                                aria-disabled={page >= pages}
+                                style={page >= pages ? { pointerEvents: 'none', opacity: 0.5 } : undefined}
+                            >
+                                Вперед
+                            </Link>
+                            <ul className="pagination-list">
+                                {Array.from({ length: pages }, (_, index) => index + 1).map(pageNumber => (
+                                    <li key={pageNumber}>
+                                        <Link
+                                            href={categoryHref(slug, sortKey, pageNumber)}
+                                            className={`pagination-link${pageNumber === page ? ' is-current' : ''}`}
+                                            aria-current={pageNumber === page ? 'page' : undefined}
+                                        >
+                                            {pageNumber}
+                                        </Link>
+                                    </li>
+                                ))}
+                            </ul>
+                        </nav>
+                    )}
                 </div>
             </div>
         </div>
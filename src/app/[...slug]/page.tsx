@@ -14,25 +14,48 @@ interface PageProps {
     params: {
         slug: string[]
     }
+    searchParams?: {
+        sort?: string
+        page?: string
+    }
 }
 
-async function preloadCategoryData(slug: string): Promise<{
+async function preloadCategoryData(slug: string, sortKey: string, page: number): Promise<{
     category: Category;
     products: Product[];
+    sortKey: string;
+    page: number;
+    pages: number;
+    total: number;
     markdown: string;
     filterConfig: AutoFilterConfig;
-    thumbnails: string[][];
+    thumbnails: Record<string, string[]>;
 } | null> {
     const categories = dataService.getCategories()
 		const category: Category | undefined = categories[slug as keyof Categories];
     if (!category) return null
 
-    const products = dataService.getProductsByCategory(slug)
+    // Готовый срез из category_pages.py; если срезы не собраны - сортировка на сервере
+    const categoryPage = dataService.getCategoryPage(slug, sortKey, page)
+        ?? dataService.buildCategoryPage(slug, sortKey, page)
+    if (!categoryPage) return null
+
+    const products = categoryPage.products
     const markdown = await dataService.getPageMarkdown([slug])
     const filterConfig = dataService.getFilterConfigForCategory(slug)
-    const thumbnails = products.map(p => ImageService.getProductThumbnails(p, slug))
-
-    return { category, products, markdown, filterConfig, thumbnails }
+    const thumbnails = Object.fromEntries(products.map(p => [p.id, ImageService.getProductThumbnails(p, slug)]))
+
+    return {
+        category,
+        products,
+        sortKey,
+        page: categoryPage.page,
+        pages: categoryPage.pages,
+        total: categoryPage.total,
+        markdown,
+        filterConfig,
+        thumbnails,
+    }
 }
 
 function ProductPage({ categorySlug, productSlug }: { categorySlug: string; productSlug: string }) {
@@ -126,7 +149,7 @@ function ProductPage({ categorySlug, productSlug }: { categorySlug: string; prod
     )
 }
 
-export default async function DynamicPage({ params }: PageProps) {
+export default async function DynamicPage({ params, searchParams }: PageProps) {
     const { slug } = params
 
     if (!slug || slug.length === 0) {
@@ -134,7 +157,9 @@ export default async function DynamicPage({ params }: PageProps) {
     }
 
     if (slug.length === 1) {
-        const data = await preloadCategoryData(slug[0])
+        const sortKey = searchParams?.sort || 'default'
+        const page = searchParams?.page ? Number(searchParams.page) : 1
+        const data = await preloadCategoryData(slug[0], sortKey, page)
         if (!data) return notFound()
         return <ClientCategoryPage initialData={data} slug={slug[0]} />
     } else if (slug.length === 2) {
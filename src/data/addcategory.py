@@ -1,13 +1,14 @@
-import json
 import os
 import re
 from typing import Dict, List, Any, Tuple, Union
 
+import jsoncodec
+from catalog_stats import collect_stats
+
 def load_products(file_path: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """Загружает данные о товарах из JSON файла"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return jsoncodec.load(file_path)
     except Exception as e:
         print(f"❌ Ошибка загрузки файла: {e}")
         return {}
@@ -15,46 +16,56 @@ def load_products(file_path: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]
 def save_products(file_path: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
     """Сохраняет данные о товарах в JSON файл"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        jsoncodec.dump(data, file_path)
         print(f"✅ Файл успешно сохранен: {file_path}")
     except Exception as e:
         print(f"❌ Ошибка сохранения файла: {e}")
 
+def _key_statistics(keys_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Преобразует статистику catalog_stats в формат меню анализа"""
+    return {
+        key: {
+            'count': stats.count,
+            'sample_values': stats.samples,
+            'type': stats.main_type,
+            'types': dict(stats.types),
+            'cardinality': stats.cardinality,
+            'exact': stats.exact,
+            'min': stats.min,
+            'max': stats.max,
+        }
+        for key, stats in keys_stats.items()
+    }
+
 def analyze_products_structure(products_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
-    """Анализирует структуру данных о товарах"""
+    """Анализирует структуру данных о товарах по всему каталогу"""
     analysis = {
         'total_products': 0,
         'format': 'unknown',
         'keys_statistics': {},
+        'categories_statistics': {},
         'sample_products': []
     }
     
     if isinstance(products_data, dict):
         analysis['format'] = 'dict'
-        analysis['total_products'] = len(products_data)
-        products_list = list(products_data.values())[:5]  # Берем первые 5 товаров для анализа
+        products_list = list(products_data.values())
     elif isinstance(products_data, list):
         analysis['format'] = 'list'
-        analysis['total_products'] = len(products_data)
-        products_list = products_data[:5]
+        products_list = products_data
     else:
         return analysis
     
-    # Анализируем ключи
-    for product in products_list:
-        for key, value in product.items():
-            if key not in analysis['keys_statistics']:
-                analysis['keys_statistics'][key] = {
-                    'count': 0,
-                    'sample_values': set(),
-                    'type': type(value).__name__
-                }
-            analysis['keys_statistics'][key]['count'] += 1
-            if len(analysis['keys_statistics'][key]['sample_values']) < 3:
-                analysis['keys_statistics'][key]['sample_values'].add(str(value))
-    
-    analysis['sample_products'] = products_list
+    # Статистика по ключам собирается за один проход по всем товарам
+    stats = collect_stats(products_list)
+    analysis['total_products'] = stats['total']
+    analysis['keys_statistics'] = _key_statistics(stats['keys'])
+    analysis['categories_statistics'] = {
+        slug: {'total': data['total'], 'keys_statistics': _key_statistics(data['keys'])}
+        for slug, data in stats['categories'].items()
+    }
+    
+    analysis['sample_products'] = products_list[:5]
     return analysis
 
 def find_products_by_criteria(products_data: Union[Dict[str, Any], List[Dict[str, Any]]], criteria_key: str, criteria_value: str, case_sensitive: bool = False) -> Tuple[List[Dict[str, Any]], List[str]]:
@@ -115,6 +126,20 @@ def add_categories_to_products(products_data: Union[Dict[str, Any], List[Dict[st
     
     return updated_data
 
+def print_keys_statistics(keys_statistics: Dict[str, Any], total: int) -> None:
+    """Печатает статистику по ключам"""
+    for key, stats in keys_statistics.items():
+        sample_values = list(stats['sample_values'])[:3]
+        types = ', '.join(f"{name}: {count}" for name, count in stats['types'].items())
+        cardinality = stats['cardinality'] if stats['exact'] else f"~{stats['cardinality']}"
+        print(f"   '{key}': {stats['count']} из {total} товаров, тип: {stats['type']}, различных: {cardinality}")
+        if len(stats['types']) > 1:
+            print(f"      типы: {types}")
+        if stats['min'] is not None:
+            print(f"      диапазон: {stats['min']} - {stats['max']}")
+        if sample_values:
+            print(f"      примеры: {', '.join(sample_values)}")
+
 def show_products_analysis(products_file: str):
     """Показывает анализ структуры товаров"""
     products_data = load_products(products_file)
@@ -129,11 +154,31 @@ def show_products_analysis(products_file: str):
     
     if analysis['keys_statistics']:
         print(f"\n📋 СТАТИСТИКА ПО КЛЮЧАМ:")
-        for key, stats in analysis['keys_statistics'].items():
-            sample_values = list(stats['sample_values'])[:3]
-            print(f"   '{key}': {stats['count']} товаров, тип: {stats['type']}")
-            if sample_values:
-                print(f"      примеры: {', '.join(sample_values)}")
+        print_keys_statistics(analysis['keys_statistics'], analysis['total_products'])
+
+def show_categories_analysis(products_file: str):
+    """Показывает статистику по ключам в разрезе категорий"""
+    products_data = load_products(products_file)
+    if not products_data:
+        return
+    
+    analysis = analyze_products_structure(products_data)
+    categories = analysis['categories_statistics']
+    if not categories:
+        print("❌ У товаров нет категорий")
+        return
+    
+    print(f"\n🏷️  Категории: {', '.join(categories.keys())}")
+    category = input("Введите категорию (пусто - все): ").strip()
+    if category and category not in categories:
+        print(f"❌ Категория '{category}' не найдена")
+        return
+    
+    for slug, data in categories.items():
+        if category and slug != category:
+            continue
+        print(f"\n📋 КАТЕГОРИЯ '{slug}': {data['total']} товаров")
+        print_keys_statistics(data['keys_statistics'], data['total'])
 
 def interactive_category_management(products_file: str):
     """Интерактивное управление категориями"""
@@ -257,8 +302,9 @@ def show_menu() -> None:
     print("🎯 МЕНЕДЖЕР КАТЕГОРИЙ ТОВАРОВ")
     print("="*50)
     print("1. Анализ структуры товаров")
-    print("2. Добавить категории по критерию")
-    print("3. Выход")
+    print("2. Статистика по категориям")
+    print("3. Добавить категории по критерию")
+    print("4. Выход")
     print("="*50)
 
 def main():
@@ -276,20 +322,22 @@ def main():
     # Главный цикл программы
     while True:
         show_menu()
-        choice = input("\nВыберите действие (1-3): ").strip()
+        choice = input("\nВыберите действие (1-4): ").strip()
         
         if choice == '1':
             show_products_analysis(products_file)
         elif choice == '2':
-            interactive_category_management(products_file)
+            show_categories_analysis(products_file)
         elif choice == '3':
+            interactive_category_management(products_file)
+        elif choice == '4':
             print("\n👋 До свидания!")
             break
         else:
             print("❌ Неверный выбор. Попробуйте снова.")
         
         # Пауза перед следующим показом меню
-        if choice != '3':
+        if choice != '4':
             input("\nНажмите Enter чтобы продолжить...")
 
 if __name__ == "__main__":
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Set
+
+import jsoncodec
+
+# Файлы каталога, от которых зависят страницы витрины
+CATALOG_FILES = ('products', 'prices', 'actionPrices', 'categories')
+
+# Поля, которые подмешиваются в запись товара из файлов цен
+PRICE_FIELDS = {'prices': 'price', 'actionPrices': 'actionPrice'}
+
+def _git(args: List[str]) -> subprocess.CompletedProcess:
+    """Запускает git из папки скрипта: пути вида REV:./file и -- file считаются от нее"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.run(['git', *args], cwd=script_dir, capture_output=True)
+
+def validate_source(source: str) -> None:
+    """Проверяет, что источник - существующая папка или git-ревизия, иначе ValueError"""
+    if os.path.isdir(source):
+        return
+    if _git(['rev-parse', '--verify', '--quiet', f"{source}^{{commit}}"]).returncode != 0:
+        raise ValueError(f"'{source}' не является ни папкой, ни git-ревизией")
+
+def load_catalog_file(source: str, name: str) -> Optional[Any]:
+    """Загружает файл каталога из папки или из git-ревизии (например HEAD~1).
+
+    None возвращается, только если файла нет в папке или в ревизии;
+    остальные ошибки git приводят к ValueError.
+    """
+    filename = f"{name}.json"
+    if os.path.isdir(source):
+        file_path = os.path.join(source, filename)
+        if not os.path.exists(file_path):
+            return None
+        return jsoncodec.load(file_path)
+
+    listed = _git(['ls-tree', '--name-only', source, '--', filename])
+    if listed.returncode != 0:
+        raise ValueError(f"git ls-tree {source}: {listed.stderr.decode('utf-8', 'replace').strip()}")
+    if not listed.stdout.strip():
+        return None
+    result = _git(['show', f"{source}:./{filename}"])
+    if result.returncode != 0:
+        raise ValueError(f"git show {source}:{filename}: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return jsoncodec.loads(result.stdout)
+
+def load_catalog(source: str) -> Dict[str, Any]:
+    """Загружает все файлы каталога одной версии; отсутствующие в версии файлы считаются пустыми"""
+    validate_source(source)
+    catalog = {}
+    for name in CATALOG_FILES:
+        data = load_catalog_file(source, name)
+        catalog[name] = data if data is not None else ([] if name == 'products' else {})
+    return catalog
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Считает хеш записи по каноническому JSON (ключи отсортированы)"""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+def index_products(catalog: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Строит словарь id -> запись товара с подмешанными ценами"""
+    indexed = {}
+    for product in catalog['products']:
+        if 'id' not in product:
+            continue
+        product_id = product['id']
+        if product_id in indexed:
+            # В stderr, чтобы не ломать вывод --json
+            print(f"⚠️  Повторяющийся id '{product_id}', используется последняя запись", file=sys.stderr)
+        record = dict(product)
+        for file_name, field in PRICE_FIELDS.items():
+            if product_id in catalog[file_name]:
+                record[field] = catalog[file_name][product_id]
+        indexed[product_id] = record
+    return indexed
+
+def changed_fields(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Возвращает список полей, которые добавлены, удалены или изменены"""
+    missing = object()
+    return sorted(key for key in old.keys() | new.keys() if old.get(key, missing) != new.get(key, missing))
+
+def diff_catalogs(old_catalog: Dict[str, Any], new_catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """Сравнивает две версии каталога по id товара.
+
+    Записи сначала сравниваются по хешу, поля разбираются только у товаров
+    с различающимся хешем.
+    """
+    old_products = index_products(old_catalog)
+    new_products = index_products(new_catalog)
+
+    old_hashes = {pid: record_hash(record) for pid, record in old_products.items()}
+    new_hashes = {pid: record_hash(record) for pid, record in new_products.items()}
+
+    added = sorted(new_hashes.keys() - old_hashes.keys())
+    removed = sorted(old_hashes.keys() - new_hashes.keys())
+    modified = {}
+    for pid in sorted(old_hashes.keys() & new_hashes.keys()):
+        if old_hashes[pid] != new_hashes[pid]:
+            modified[pid] = changed_fields(old_products[pid], new_products[pid])
+
+    old_categories = old_catalog['categories']
+    new_categories = new_catalog['categories']
+    categories_changed = sorted(
+        slug for slug in old_categories.keys() | new_categories.keys()
+        if old_categories.get(slug) != new_categories.get(slug)
+    )
+
+    return {
+        'added': added,
+        'removed': removed,
+        'modified': modified,
+        'categories_changed': categories_changed,
+        'old_products': old_products,
+        'new_products': new_products,
+        'unchanged': len(old_hashes.keys() & new_hashes.keys()) - len(modified),
+    }
+
+def _product_categories(product: Dict[str, Any]) -> List[str]:
+    """Возвращает категории товара списком (поле может быть строкой)"""
+    categories = product.get('categories', [])
+    return [categories] if isinstance(categories, str) else list(categories)
+
+def affected_paths(diff: Dict[str, Any], categories: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Определяет страницы витрины, которые нужно перевалидировать.
+
+    Для каждого затронутого товара берутся его категории и slug в обеих
+    версиях: страница категории /<категория> и страница товара
+    /<категория>/<slug>. Запись в categories.json выводится и на страницах
+    товаров (например название в хлебных крошках), поэтому при ее изменении
+    затрагиваются все товары категории, а также главная страница / с деревом
+    категорий. Учитываются только категории из categories.json, для остальных
+    витрина страниц не строит.
+    """
+    changed_categories = set(slug for slug in diff['categories_changed'] if slug in categories)
+    affected_categories: Set[str] = set(changed_categories)
+    paths: Set[str] = set()
+
+    touched = set(diff['added'] + diff['removed'] + list(diff['modified']))
+    for products in (diff['old_products'], diff['new_products']):
+        for pid, product in products.items():
+            product_categories = _product_categories(product)
+            if pid not in touched and changed_categories.isdisjoint(product_categories):
+                continue
+            for category_slug in product_categories:
+                if category_slug not in categories:
+                    continue
+                if pid not in touched and category_slug not in changed_categories:
+                    continue
+                affected_categories.add(category_slug)
+                if product.get('slug'):
+                    paths.add(f"/{category_slug}/{product['slug']}")
+
+    paths.update(f"/{slug}" for slug in affected_categories)
+    # Главная строит дерево категорий из categories.json (src/app/page.tsx)
+    if diff['categories_changed']:
+        paths.add('/')
+    return {
+        'categories': sorted(affected_categories),
+        'paths': sorted(paths),
+    }
+
+def print_report(diff: Dict[str, Any], affected: Dict[str, List[str]]) -> None:
+    """Печатает отчет о различиях"""
+    print(f"\n📊 СРАВНЕНИЕ КАТАЛОГА:")
+    print(f"   Без изменений: {diff['unchanged']}")
+    print(f"   Добавлено: {len(diff['added'])}")
+    print(f"   Удалено: {len(diff['removed'])}")
+    print(f"   Изменено: {len(diff['modified'])}")
+
+    for pid in diff['added']:
+        print(f"   + {pid}")
+    for pid in diff['removed']:
+        print(f"   - {pid}")
+    for pid, fields in diff['modified'].items():
+        print(f"   ~ {pid}: {', '.join(fields)}")
+
+    if diff['categories_changed']:
+        print(f"\n🏷️  Изменены категории: {', '.join(diff['categories_changed'])}")
+
+    print(f"\n🔄 СТРАНИЦЫ ДЛЯ ПЕРЕВАЛИДАЦИИ ({len(affected['paths'])}):")
+    for path in affected['paths']:
+        print(f"   {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение двух версий каталога и список затронутых страниц")
+    parser.add_argument('old', help="Старая версия: папка с JSON файлами или git-ревизия (например HEAD~1)")
+    parser.add_argument('new', nargs='?', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Новая версия: папка или git-ревизия (по умолчанию папка скрипта)")
+    parser.add_argument('--json', action='store_true', help="Вывести результат в JSON для скриптов деплоя")
+    args = parser.parse_args()
+
+    try:
+        old_catalog = load_catalog(args.old)
+        new_catalog = load_catalog(args.new)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    diff = diff_catalogs(old_catalog, new_catalog)
+    # Страницы удаленных категорий тоже нужно сбросить, поэтому объединяем обе версии
+    categories = {**old_catalog['categories'], **new_catalog['categories']}
+    affected = affected_paths(diff, categories)
+
+    if args.json:
+        print(jsoncodec.dumps({
+            'added': diff['added'],
+            'removed': diff['removed'],
+            'modified': diff['modified'],
+            'categories_changed': diff['categories_changed'],
+            'categories': affected['categories'],
+            'paths': affected['paths'],
+        }))
+    else:
+        print_report(diff, affected)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+import argparse
+import bisect
+import hashlib
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import jsoncodec
+
+# Пока различных значений не больше этого числа, они хранятся точно;
+# дальше мощность оценивается HyperLogLog
+EXACT_LIMIT = 1024
+
+# Точность HyperLogLog: 2^12 регистров по байту, погрешность около 1.6%
+HLL_PRECISION = 12
+
+# Число корзин потоковой гистограммы числовых значений
+HISTOGRAM_BINS = 16
+
+# Сколько самых частых значений отслеживать (алгоритм Мисры-Гриса)
+TOP_VALUES = 10
+
+# Сколько примеров значений сохранять для меню анализа
+SAMPLE_VALUES = 3
+
+# Ключи, по которым витрина не строит фильтры (см. FilterService.generateFilterConfig)
+FILTER_SKIP_KEYS = ('id', 'slug', 'title', 'categories', 'desc', 'img', 'badge', 'brand')
+
+def js_string(value: Any) -> str:
+    """Приводит значение к строке так же, как String(value) в JavaScript"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, list):
+        return ','.join('' if item is None else js_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+def _is_number(value: Any) -> bool:
+    """Проверяет, что значение - число (bool в JSON числом не считается)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _normalize(value: Any) -> Any:
+    """Приводит значение к виду для подсчета различных, как в JS: 5.0 и 5 совпадают,
+    остальные значения сравниваются по строковому представлению"""
+    if _is_number(value):
+        return int(value) if isinstance(value, float) and value.is_integer() else value
+    return js_string(value)
+
+class HyperLogLog:
+    """Оценка числа различных значений в фиксированной памяти"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value: Any) -> None:
+        key = f"{type(value).__name__}:{value}".encode('utf-8')
+        x = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Поправка для малых мощностей (linear counting)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
+
+class StreamingHistogram:
+    """Потоковая гистограмма с ограниченным числом корзин.
+
+    Каждое значение добавляется как отдельная корзина; при превышении
+    лимита сливаются две соседние корзины с ближайшими центрами.
+    """
+
+    def __init__(self, max_bins: int = HISTOGRAM_BINS):
+        self.max_bins = max_bins
+        self.centroids: List[float] = []
+        self.counts: List[int] = []
+
+    def add(self, value: float) -> None:
+        index = bisect.bisect_left(self.centroids, value)
+        if index < len(self.centroids) and self.centroids[index] == value:
+            self.counts[index] += 1
+            return
+        self.centroids.insert(index, value)
+        self.counts.insert(index, 1)
+        if len(self.centroids) > self.max_bins:
+            self._merge_closest()
+
+    def _merge_closest(self) -> None:
+        gaps = [self.centroids[i + 1] - self.centroids[i] for i in range(len(self.centroids) - 1)]
+        i = gaps.index(min(gaps))
+        total = self.counts[i] + self.counts[i + 1]
+        self.centroids[i] = (self.centroids[i] * self.counts[i] + self.centroids[i + 1] * self.counts[i + 1]) / total
+        self.counts[i] = total
+        del self.centroids[i + 1]
+        del self.counts[i + 1]
+
+    def bins(self) -> List[Tuple[float, int]]:
+        return list(zip(self.centroids, self.counts))
+
+class FrequentValues:
+    """Самые частые значения по алгоритму Мисры-Гриса.
+
+    Если различных значений не больше capacity, счетчики точные.
+    """
+
+    def __init__(self, capacity: int = TOP_VALUES):
+        self.capacity = capacity
+        self.counters: Dict[Any, int] = {}
+
+    def add(self, value: Any) -> None:
+        if value in self.counters:
+            self.counters[value] += 1
+        elif len(self.counters) < self.capacity:
+            self.counters[value] = 1
+        else:
+            for key in list(self.counters):
+                self.counters[key] -= 1
+                if self.counters[key] == 0:
+                    del self.counters[key]
+
+    def top(self) -> List[Tuple[Any, int]]:
+        return sorted(self.counters.items(), key=lambda item: -item[1])
+
+class KeyStats:
+    """Статистика по одному ключу товаров, собираемая за один проход"""
+
+    def __init__(self):
+        self.count = 0
+        self.types: Counter = Counter()
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.all_integers = True
+        self.distinct: Optional[set] = set()
+        self.hll: Optional[HyperLogLog] = None
+        self.histogram = StreamingHistogram()
+        self.frequent = FrequentValues()
+        self.samples: List[str] = []
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        self.types[type(value).__name__] += 1
+        if value is None:
+            return
+
+        if _is_number(value):
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+            if isinstance(value, float) and not value.is_integer():
+                self.all_integers = False
+            self.histogram.add(value)
+
+        key = _normalize(value)
+        if self.distinct is not None:
+            self.distinct.add(key)
+            if len(self.distinct) > EXACT_LIMIT:
+                # Переходим на оценку: точное множество больше не храним
+                self.hll = HyperLogLog()
+                for item in self.distinct:
+                    self.hll.add(item)
+                self.distinct = None
+        else:
+            self.hll.add(key)
+
+        self.frequent.add(key)
+        text = js_string(value)
+        if len(self.samples) < SAMPLE_VALUES and text not in self.samples:
+            self.samples.append(text)
+
+    @property
+    def non_null(self) -> int:
+        return self.count - self.types.get('NoneType', 0)
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.non_null > 0 and all(t in ('int', 'float') for t in self.types if t != 'NoneType')
+
+    @property
+    def cardinality(self) -> int:
+        return len(self.distinct) if self.distinct is not None else self.hll.count()
+
+    @property
+    def exact(self) -> bool:
+        return self.distinct is not None
+
+    @property
+    def main_type(self) -> str:
+        return self.types.most_common(1)[0][0] if self.types else 'unknown'
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'count': self.count,
+            'types': dict(self.types),
+            'cardinality': self.cardinality,
+            'exact': self.exact,
+            'top_values': [[js_string(value), count] for value, count in self.frequent.top()],
+            'samples': self.samples,
+        }
+        if self.min is not None:
+            result['min'] = self.min
+            result['max'] = self.max
+            result['histogram'] = [[round(c, 4), n] for c, n in self.histogram.bins()]
+        return result
+
+def _product_categories(product: Dict[str, Any]) -> List[str]:
+    """Возвращает категории товара списком (поле может быть строкой)"""
+    categories = product.get('categories', [])
+    return [categories] if isinstance(categories, str) else list(categories)
+
+def collect_stats(products_data: Any) -> Dict[str, Any]:
+    """Собирает статистику по всем ключам всех товаров за один проход.
+
+    Возвращает словарь с общим числом товаров, статистикой по ключам
+    ('keys') и такой же статистикой в разрезе категорий ('categories').
+    Память на ключ ограничена и не зависит от размера каталога.
+    """
+    products = list(products_data.values()) if isinstance(products_data, dict) else products_data
+    overall: Dict[str, KeyStats] = {}
+    by_category: Dict[str, Dict[str, KeyStats]] = {}
+    category_totals: Counter = Counter()
+
+    for product in products:
+        categories = _product_categories(product)
+        for category_slug in categories:
+            category_totals[category_slug] += 1
+        for key, value in product.items():
+            if key not in overall:
+                overall[key] = KeyStats()
+            overall[key].add(value)
+            for category_slug in categories:
+                category_stats = by_category.setdefault(category_slug, {})
+                if key not in category_stats:
+                    category_stats[key] = KeyStats()
+                category_stats[key].add(value)
+
+    return {
+        'total': len(products),
+        'keys': overall,
+        'categories': {
+            slug: {'total': category_totals[slug], 'keys': keys}
+            for slug, keys in by_category.items()
+        },
+    }
+
+def detect_filter_type(stats: Optional[KeyStats], title: str) -> Dict[str, Any]:
+    """Определяет тип фильтра по статистике ключа.
+
+    Повторяет правила FilterService.autoDetectFilterType, но без
+    повторного прохода по товарам. Если различных строковых значений
+    больше EXACT_LIMIT, список values не сохраняется: витрина досчитывает
+    такой ключ на лету (getFilterConfigForCategory в dataService.ts).
+    """
+    if stats is None or stats.non_null == 0:
+        return {'type': 'select', 'title': title}
+
+    if stats.is_numeric:
+        if stats.all_integers:
+            if stats.cardinality > 5:
+                return {'type': 'range', 'title': title, 'min': stats.min, 'max': stats.max, 'step': 1}
+            return {
+                'type': 'number',
+                'title': title,
+                'values': [js_string(v) for v in sorted(stats.distinct)],
+            }
+        return {'type': 'range', 'title': title, 'min': stats.min, 'max': stats.max, 'step': 0.1}
+
+    filter_type = 'select' if stats.cardinality > 3 else 'checkbox'
+    option = {'type': filter_type, 'title': title}
+    if stats.exact:
+        option['values'] = sorted(set(js_string(v) for v in stats.distinct))
+    return option
+
+def build_filter_config(category_stats: Dict[str, KeyStats], filter_keys: Dict[str, str],
+                        exclude_keys: List[str]) -> Dict[str, Any]:
+    """Строит конфигурацию фильтров категории, как FilterService.generateFilterConfig"""
+    config = {}
+    for key, stats in category_stats.items():
+        if key in FILTER_SKIP_KEYS or key in exclude_keys:
+            continue
+        config[key] = detect_filter_type(stats, filter_keys.get(key) or key)
+    return config
+
+def build_filter_configs(stats: Dict[str, Any], categories: Dict[str, Any],
+                         filter_keys: Dict[str, str]) -> Dict[str, Any]:
+    """Строит конфигурации фильтров для всех категорий из categories.json"""
+    configs = {}
+    for slug, category in categories.items():
+        category_stats = stats['categories'].get(slug)
+        if not category_stats:
+            continue
+        configs[slug] = build_filter_config(category_stats['keys'], filter_keys, category.get('exclude_keys', []))
+    return configs
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 содержимого файла (как есть, с BOM) - витрина сверяет его перед
+    использованием filterConfig.json"""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_json(file_path: str) -> Any:
+    """Загружает JSON файл (BOM допускается)"""
+    return jsoncodec.load(file_path)
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Статистика по атрибутам каталога и предрасчет фильтров")
+    parser.add_argument('--products', default=os.path.join(script_dir, 'products.json'))
+    parser.add_argument('--categories', default=os.path.join(script_dir, 'categories.json'))
+    parser.add_argument('--keys', default=os.path.join(script_dir, 'keys.json'))
+    parser.add_argument('--stats', help="Сохранить полную статистику в JSON файл")
+    parser.add_argument('--filters', help="Сохранить предрасчитанные фильтры (для витрины: filterConfig.json)")
+    args = parser.parse_args()
+
+    stats = collect_stats(load_json(args.products))
+    print(f"Товаров: {stats['total']}, ключей: {len(stats['keys'])}, категорий: {len(stats['categories'])}")
+
+    if args.stats:
+        report = {
+            'total': stats['total'],
+            'keys': {key: key_stats.to_dict() for key, key_stats in stats['keys'].items()},
+            'categories': {
+                slug: {
+                    'total': data['total'],
+                    'keys': {key: key_stats.to_dict() for key, key_stats in data['keys'].items()},
+                }
+                for slug, data in stats['categories'].items()
+            },
+        }
+        jsoncodec.dump(report, args.stats)
+        print(f"Статистика сохранена в {args.stats}")
+
+    if args.filters:
+        configs = build_filter_configs(stats, load_json(args.categories), load_json(args.keys))
+        # Хеши исходных файлов: при изменении любого из них витрина игнорирует
+        # устаревший файл и строит фильтры на лету (getFilterConfigForCategory)
+        sources = {
+            'products': file_hash(args.products),
+            'categories': file_hash(args.categories),
+            'keys': file_hash(args.keys),
+        }
+        jsoncodec.dump({'sources': sources, 'categories': configs}, args.filters)
+        print(f"Фильтры для {len(configs)} категорий сохранены в {args.filters}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import math
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jsoncodec
+from catalog_stats import file_hash
+
+# Размер страницы категории по умолчанию
+PAGE_SIZE = 24
+
+# Исходные файлы срезов: их хеши сохраняются в index.json, и витрина не
+# использует срезы, если какой-то из файлов изменился после сборки
+SOURCE_FILES = ('products', 'prices', 'actionPrices', 'categories')
+
+# Порядки сортировки: имя -> (поле товара, по убыванию).
+# Имена совпадают с SORTOPTIONS в ClientCategoryPage.tsx
+SORT_FIELDS: Dict[str, Tuple[str, bool]] = {
+    'price-asc': ('price', False),
+    'price-desc': ('price', True),
+    'name-asc': ('title', False),
+    'name-desc': ('title', True),
+    'power-asc': ('power_kw', False),
+    'power-desc': ('power_kw', True),
+    'area-asc': ('area_max', False),
+    'area-desc': ('area_max', True),
+}
+
+def load_json(file_path: str) -> Any:
+    """Загружает JSON файл (BOM допускается)"""
+    return jsoncodec.load(file_path)
+
+def effective_price(product_id: str, prices: Dict[str, Any], action_prices: Dict[str, Any]) -> Optional[float]:
+    """Возвращает цену, по которой товар попадет в корзину: акционную из
+    actionPrices.json, при ее отсутствии - из prices.json (как в cart/page.tsx).
+
+    Цена 0 или отсутствие цены означает "цена по запросу" (None).
+    """
+    return action_prices.get(product_id) or prices.get(product_id) or None
+
+def title_key(title: str) -> str:
+    """Ключ сортировки названий, близкий к localeCompare(..., 'ru'): без учета регистра, ё = е"""
+    return title.casefold().replace('ё', 'е')
+
+def _numeric(value: Any) -> Optional[float]:
+    """Возвращает числовое значение поля или None, если поле не числовое"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+def sort_ids(records: List[Dict[str, Any]], field: str, descending: bool) -> List[str]:
+    """Сортирует товары по полю и возвращает список id.
+
+    Товары без значения (в том числе "цена по запросу") всегда идут в конце,
+    при равных значениях сохраняется порядок каталога.
+    """
+    if field == 'title':
+        value_of: Callable[[Dict[str, Any]], Any] = lambda record: title_key(str(record.get('title', '')))
+    else:
+        value_of = lambda record: _numeric(record.get(field))
+
+    with_value = [record for record in records if value_of(record) is not None]
+    without_value = [record for record in records if value_of(record) is None]
+    # sort(reverse=True) устойчива: равные значения остаются в порядке каталога
+    with_value.sort(key=value_of, reverse=descending)
+    return [record['id'] for record in with_value + without_value]
+
+def product_in_category(product: Dict[str, Any], category_slug: str) -> bool:
+    """Проверяет принадлежность товара категории, как productInCategory в dataService.ts"""
+    categories = product.get('categories')
+    if not categories:
+        return False
+    return category_slug in categories if isinstance(categories, list) else categories == category_slug
+
+def build_category_orders(products: List[Dict[str, Any]], category_slug: str, prices: Dict[str, Any],
+                          action_prices: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Строит все порядки сортировки товаров категории (списки id)"""
+    records = []
+    for product in products:
+        if 'id' not in product or not product_in_category(product, category_slug):
+            continue
+        record = dict(product)
+        record['price'] = effective_price(product['id'], prices, action_prices)
+        records.append(record)
+
+    orders = {'default': [record['id'] for record in records]}
+    for sort_name, (field, descending) in SORT_FIELDS.items():
+        orders[sort_name] = sort_ids(records, field, descending)
+    return orders
+
+def page_record(product: Dict[str, Any], prices: Dict[str, Any], action_prices: Dict[str, Any]) -> Dict[str, Any]:
+    """Запись товара для страницы: товар с подмешанными ценами"""
+    record = dict(product)
+    product_id = product['id']
+    if product_id in prices:
+        record['price'] = prices[product_id]
+    if product_id in action_prices:
+        record['actionPrice'] = action_prices[product_id]
+    return record
+
+def write_category_pages(output_dir: str, category_slug: str, orders: Dict[str, List[str]],
+                         products_by_id: Dict[str, Dict[str, Any]], prices: Dict[str, Any],
+                         action_prices: Dict[str, Any], page_size: int, sources: Dict[str, str]) -> int:
+    """Записывает индекс и срезы страниц категории, возвращает число файлов страниц.
+
+    Структура: <output_dir>/<категория>/index.json и
+    <output_dir>/<категория>/<сортировка>/<номер страницы>.json (с 1).
+    В индекс записываются хеши исходных файлов (sources).
+    """
+    category_dir = os.path.join(output_dir, category_slug)
+    if os.path.isdir(category_dir):
+        shutil.rmtree(category_dir)
+    os.makedirs(category_dir)
+
+    total = len(orders['default'])
+    pages_count = max(1, math.ceil(total / page_size))
+    index = {
+        'total': total,
+        'page_size': page_size,
+        'pages': pages_count,
+        'orders': orders,
+        'sources': sources,
+    }
+    jsoncodec.dump(index, os.path.join(category_dir, 'index.json'))
+
+    written = 0
+    for sort_name, ids in orders.items():
+        sort_dir = os.path.join(category_dir, sort_name)
+        os.makedirs(sort_dir)
+        for page in range(pages_count):
+            page_ids = ids[page * page_size:(page + 1) * page_size]
+            page_data = {
+                'page': page + 1,
+                'pages': pages_count,
+                'total': total,
+                'products': [page_record(products_by_id[pid], prices, action_prices) for pid in page_ids],
+            }
+            jsoncodec.dump(page_data, os.path.join(sort_dir, f"{page + 1}.json"))
+            written += 1
+    return written
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Предрасчет сортировок и страниц категорий")
+    parser.add_argument('--output', default=os.path.join(script_dir, 'pages'), help="Папка для страниц")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help="Товаров на странице")
+    args = parser.parse_args()
+
+    products = load_json(os.path.join(script_dir, 'products.json'))
+    categories = load_json(os.path.join(script_dir, 'categories.json'))
+    prices = load_json(os.path.join(script_dir, 'prices.json'))
+    action_prices = load_json(os.path.join(script_dir, 'actionPrices.json'))
+    sources = {name: file_hash(os.path.join(script_dir, f"{name}.json")) for name in SOURCE_FILES}
+
+    products_by_id = {}
+    for product in products:
+        if 'id' in product:
+            products_by_id.setdefault(product['id'], product)
+
+    os.makedirs(args.output, exist_ok=True)
+    for category_slug in categories:
+        orders = build_category_orders(products, category_slug, prices, action_prices)
+        written = write_category_pages(args.output, category_slug, orders, products_by_id,
+                                       prices, action_prices, args.page_size, sources)
+        print(f"Категория '{category_slug}': {len(orders['default'])} товаров, {written} страниц")
+
+    print(f"Страницы сохранены в {args.output}")
+
+if __name__ == "__main__":
+    main()
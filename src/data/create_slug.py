@@ -1,6 +1,8 @@
 ﻿import json
 import re
 
+import jsoncodec
+
 def generate_abbreviation(slug):
     """
     Генерирует аббревиатуру из slug: первые буквы каждого слова и все цифры
@@ -53,8 +55,7 @@ def process_json_file(input_file, output_file=None):
     
     # Загружаем данные
     try:
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            data = json.load(f)
+        data = jsoncodec.load(input_file)
     except FileNotFoundError:
         print(f"Файл {input_file} не найден")
         return
@@ -67,8 +68,7 @@ def process_json_file(input_file, output_file=None):
     processed_data = process_slug_and_id(data)
     
     # Сохраняем результат
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(processed_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(processed_data, output_file)
     
     print(f"Обработка завершена. Результат сохранен в {output_file}")
 
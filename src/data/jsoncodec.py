@@ -0,0 +1,163 @@
+import argparse
+import json
+import math
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Метка порядка байтов UTF-8: при чтении допускается, при записи не ставится
+BOM = b'\xef\xbb\xbf'
+
+# Переменная окружения для принудительного выбора реализации (json или orjson)
+BACKEND_ENV = 'BSBS_JSON_BACKEND'
+
+def strip_bom(data: bytes) -> bytes:
+    """Убирает BOM в начале данных, если он есть"""
+    return data[len(BOM):] if data.startswith(BOM) else data
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data.decode('utf-8'))
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+BACKENDS: Dict[str, Tuple[Callable[[bytes], Any], Callable[[Any], bytes]]] = {
+    'json': (_json_loads, _json_dumps),
+}
+
+if orjson is not None:
+    # orjson иначе, чем repr(float), записывает очень большие и очень малые
+    # числа (1e16, 2.5e-7, 0.00005). Такие числа в выводе с отступами - всегда
+    # значения: перед ними пробел, после - запятая или конец строки
+    # (перевод строки внутри JSON-строки всегда экранирован)
+    _FLOAT_RE = re.compile(rb' -?(?:[1-9](?:\.\d+)?e-?\d+|0\.0000\d+)(?=,?\n|,?$)')
+
+    def _python_float(match: re.Match) -> bytes:
+        """Переписывает число так, как его записал бы json из stdlib"""
+        return b' ' + repr(float(match.group()[1:])).encode('ascii')
+
+    def _has_non_finite(obj: Any) -> bool:
+        """Есть ли в данных NaN или бесконечность (обход без рекурсии)"""
+        stack = [obj]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, float):
+                if not math.isfinite(value):
+                    return True
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+        return False
+
+    def _orjson_loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Повторяем через json, чтобы ошибка была такой же, как без orjson
+            return _json_loads(data)
+
+    def _orjson_dumps(obj: Any) -> bytes:
+        if not isinstance(obj, (dict, list)):
+            # Одиночное значение: выигрыша нет, а число без пробела перед ним регулярка не найдет
+            return _json_dumps(obj)
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            # Нестроковые ключи, большие целые и т.п. - оставляем stdlib
+            return _json_dumps(obj)
+        # orjson молча пишет NaN и бесконечность как null, а json - как NaN/Infinity.
+        # Такие числа дают null в выводе, поэтому обходим данные только при его наличии
+        if b'null' in data and _has_non_finite(obj):
+            return _json_dumps(obj)
+        return _FLOAT_RE.sub(_python_float, data)
+
+    BACKENDS['orjson'] = (_orjson_loads, _orjson_dumps)
+
+_backend = os.environ.get(BACKEND_ENV) or ('orjson' if 'orjson' in BACKENDS else 'json')
+if _backend not in BACKENDS:
+    _backend = 'json'
+
+def get_backend() -> str:
+    """Имя используемой реализации"""
+    return _backend
+
+def set_backend(name: str) -> None:
+    """Выбирает реализацию: 'json' (stdlib) или 'orjson', если установлен"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Реализация JSON '{name}' недоступна. Доступные: {', '.join(BACKENDS)}")
+    _backend = name
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Разбирает JSON из байтов или строки, BOM допускается"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return BACKENDS[_backend][0](strip_bom(data))
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Сериализует в канонический вид: отступ 2, без экранирования не-ASCII,
+    порядок ключей сохраняется, без BOM и перевода строки в конце"""
+    return BACKENDS[_backend][1](obj)
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode('utf-8')
+
+def load(file_path: str) -> Any:
+    """Загружает JSON файл, BOM допускается"""
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
+
+def dump(obj: Any, file_path: str) -> None:
+    """Сохраняет JSON файл в каноническом виде (UTF-8 без BOM)"""
+    with open(file_path, 'wb') as f:
+        f.write(dumps_bytes(obj))
+
+def benchmark(file_path: str, repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    """Замеряет чтение и запись файла каждой реализацией и проверяет одинаковость вывода"""
+    with open(file_path, 'rb') as f:
+        raw = strip_bom(f.read())
+
+    results = {}
+    outputs = {}
+    for name, (backend_loads, backend_dumps) in BACKENDS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            data = backend_loads(raw)
+        load_time = (time.perf_counter() - start) / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            outputs[name] = backend_dumps(data)
+        dump_time = (time.perf_counter() - start) / repeats
+        results[name] = {'load': load_time, 'dump': dump_time}
+
+    if len(set(outputs.values())) > 1:
+        raise AssertionError(f"Реализации JSON дают разный вывод для {file_path}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение реализаций JSON и приведение файлов к каноническому виду")
+    parser.add_argument('files', nargs='+', help="JSON файлы")
+    parser.add_argument('--bench', action='store_true', help="Замерить скорость чтения и записи")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for file_path in args.files:
+        if args.bench:
+            results = benchmark(file_path, args.repeats)
+            print(f"{file_path}:")
+            for name, times in results.items():
+                print(f"   {name}: чтение {times['load'] * 1000:.1f} мс, запись {times['dump'] * 1000:.1f} мс")
+        else:
+            dump(load(file_path), file_path)
+            print(f"Приведен к каноническому виду: {file_path}")
+
+if __name__ == "__main__":
+    main()
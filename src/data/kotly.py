@@ -1,6 +1,8 @@
 ﻿import json
 import re
 
+import jsoncodec
+
 def fix_product_data(data):
     """
     Исправляет данные продуктов согласно требованиям:
@@ -15,6 +17,9 @@ def fix_product_data(data):
         
         # Проверяем, есть ли необходимые поля
         if 'title' in new_data and 'id' in new_data and 'img' in new_data and len(new_data['img']) > 0:
+            # Копия списка: исходная запись не меняется (иначе результат зависит от того,
+            # выполнялось ли преобразование в этом процессе или в пуле parallel.py)
+            new_data['img'] = list(new_data['img'])
             # Сохраняем старый id
             old_id = new_data['id']
             
@@ -66,8 +71,7 @@ def process_json_file(input_file, output_file=None):
     
     # Загружаем данные
     try:
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            data = json.load(f)
+        data = jsoncodec.load(input_file)
     except FileNotFoundError:
         print(f"Файл {input_file} не найден")
         return
@@ -80,8 +84,7 @@ def process_json_file(input_file, output_file=None):
     fixed_data = fix_product_data(data)
     
     # Сохраняем результат
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(fixed_data, output_file)
     
     print(f"Обработка завершена. Результат сохранен в {output_file}")
 
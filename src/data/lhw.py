@@ -1,6 +1,8 @@
 ﻿import json
 import re
 
+import jsoncodec
+
 def fix_dimensions(data):
     """
     Исправляет ошибочно разбитые габариты в данных JSON
@@ -85,8 +87,7 @@ def find_problematic_keys(data):
 def main():
     # Загружаем данные
     try:
-        with open('products.json', 'r', encoding='utf-8-sig') as f:
-            data = json.load(f)
+        data = jsoncodec.load('products.json')
     except FileNotFoundError:
         print("Файл products.json не найден")
         return
@@ -111,8 +112,7 @@ def main():
     fixed_data = fix_dimensions(data)
     
     # Сохраняем исправленные данные
-    with open('products_fixed.json', 'w', encoding='utf-8') as f:
-        json.dump(fixed_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(fixed_data, 'products_fixed.json')
     
     print(f"\nИсправления завершены. Результат сохранен в products_fixed.json")
 
@@ -1,6 +1,8 @@
 ﻿import json
 from collections import defaultdict
 
+import jsoncodec
+
 def make_ids_unique(input_file, output_file=None):
     """
     Находит неуникальные ID в products.json и делает их уникальными добавлением суффиксов
@@ -10,8 +12,7 @@ def make_ids_unique(input_file, output_file=None):
     
     # Загружаем данные
     try:
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            data = json.load(f)
+        data = jsoncodec.load(input_file)
     except FileNotFoundError:
         print(f"Файл {input_file} не найден")
         return
@@ -78,8 +79,7 @@ def make_ids_unique(input_file, output_file=None):
     updated_data = update_duplicate_ids(data)
     
     # Сохраняем результат
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(updated_data, output_file)
     
     print(f"\nОбновление завершено. Результат сохранен в {output_file}")
 
@@ -1,9 +1,7 @@
-﻿import json
-import os
+﻿import jsoncodec
 
 # Читаем products.json
-with open('products.json', 'r', encoding='utf-8') as f:
-    products = json.load(f)
+products = jsoncodec.load('products.json')
 
 # Извлекаем акционные цены
 action_prices = {}
@@ -14,12 +12,10 @@ for product in products:
         del product['actionPrice']
 
 # Сохраняем actionPrices.json
-with open('actionPrices.json', 'w', encoding='utf-8') as f:
-    json.dump(action_prices, f, ensure_ascii=False, indent=2)
+jsoncodec.dump(action_prices, 'actionPrices.json')
 
 # Сохраняем обновлённый products.json (без actionPrice)
-with open('products.json', 'w', encoding='utf-8') as f:
-    json.dump(products, f, ensure_ascii=False, indent=2)
+jsoncodec.dump(products, 'products.json')
 
 print(f"Извлечено {len(action_prices)} акционных цен")
 print("Файлы actionPrices.json и products.json обновлены")
\ No newline at end of file
@@ -1,13 +1,14 @@
 ﻿import json
 
+import jsoncodec
+
 def extract_prices(input_file, prices_file):
     """
     Извлекает цены из products.json в prices.json и удаляет поле price из products.json
     """
     # Загружаем данные products.json
     try:
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            products_data = json.load(f)
+        products_data = jsoncodec.load(input_file)
     except FileNotFoundError:
         print(f"Файл {input_file} не найден")
         return
@@ -46,12 +47,10 @@ def extract_prices(input_file, prices_file):
     updated_products_data = process_data(products_data)
     
     # Сохраняем обновленный products.json
-    with open(input_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_products_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(updated_products_data, input_file)
     
     # Сохраняем prices.json
-    with open(prices_file, 'w', encoding='utf-8') as f:
-        json.dump(prices_data, f, ensure_ascii=False, indent=2)
+    jsoncodec.dump(prices_data, prices_file)
     
     print(f"Цены извлечены. Обновлен {input_file}, создан {prices_file}")
     print(f"Всего перемещено цен: {len(prices_data)}")
@@ -0,0 +1,167 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import jsoncodec
+from create_slug import process_slug_and_id
+from fixkeys import build_key_mapping, load_json_with_bom_handling, update_keys
+from kotly import fix_product_data
+from lhw import fix_dimensions
+
+# Верхняя граница размера пакета: большие пакеты дольше сериализуются
+# и хуже распределяются между процессами
+MAX_CHUNK_SIZE = 256
+
+# Число пакетов на один процесс: несколько пакетов на ядро выравнивают нагрузку
+CHUNKS_PER_WORKER = 4
+
+# Пул запускается, только если последовательная обработка по оценке займет
+# больше этого времени (с). Преобразования каталога стоят около 2 мкс на
+# товар, а передача товара в процесс и обратно - столько же, плюс запуск
+# процессов; для каталога в сотни и тысячи товаров пул всегда медленнее
+PARALLEL_MIN_SECONDS = 1.0
+
+# Зарегистрированные поэлементные преобразования: имя -> функция(товар) -> товар
+TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    'kotly': fix_product_data,
+    'lhw': fix_dimensions,
+    'slug': process_slug_and_id,
+}
+
+def register_transform(name: str, func: Callable[[Any], Any]) -> None:
+    """Регистрирует поэлементное преобразование под именем name.
+
+    Функция должна быть чистой и определена на уровне модуля (или быть
+    functools.partial от такой функции), иначе её не передать в другой процесс.
+    """
+    TRANSFORMS[name] = func
+
+def register_fixkeys(filter_file: str = 'filter.json') -> None:
+    """Регистрирует fixkeys.update_keys с соответствием ключей из filter_file"""
+    key_mapping = build_key_mapping(load_json_with_bom_handling(filter_file))
+    register_transform('fixkeys', partial(update_keys, key_mapping=key_mapping))
+
+def get_transform(name: str) -> Callable[[Any], Any]:
+    """Возвращает зарегистрированное преобразование по имени"""
+    if name not in TRANSFORMS:
+        raise KeyError(f"Неизвестное преобразование '{name}'. Доступные: {', '.join(sorted(TRANSFORMS))}")
+    return TRANSFORMS[name]
+
+def _apply_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    """Применяет преобразование к каждому элементу пакета (выполняется в процессе-обработчике)"""
+    return [func(item) for item in chunk]
+
+def compute_chunk_size(total: int, workers: int, max_chunk_size: int = MAX_CHUNK_SIZE) -> int:
+    """Подбирает размер пакета: несколько пакетов на процесс, но не больше max_chunk_size"""
+    if total <= 0:
+        return 1
+    return max(1, min(max_chunk_size, math.ceil(total / (workers * CHUNKS_PER_WORKER))))
+
+def parallel_map(func: Callable[[Any], Any], items: List[Any], workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None, min_seconds: float = PARALLEL_MIN_SECONDS) -> List[Any]:
+    """Применяет func к каждому элементу items в пуле процессов.
+
+    Список режется на пакеты ограниченного размера; результаты собираются
+    в исходном порядке, поэтому вывод совпадает с последовательным
+    [func(item) for item in items]. Первый пакет обрабатывается в текущем
+    процессе: если по его времени вся работа займет меньше min_seconds,
+    остальное тоже обрабатывается последовательно (min_seconds=0 - всегда пул).
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = compute_chunk_size(len(items), workers)
+
+    # Для одного процесса или одного пакета пул только добавит накладные расходы
+    if workers == 1 or len(items) <= chunk_size:
+        return _apply_chunk(func, items)
+
+    start = time.perf_counter()
+    result = _apply_chunk(func, items[:chunk_size])
+    estimated = (time.perf_counter() - start) / chunk_size * len(items)
+    if estimated < min_seconds:
+        result.extend(_apply_chunk(func, items[chunk_size:]))
+        return result
+
+    chunks = [items[i:i + chunk_size] for i in range(chunk_size, len(items), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # executor.map сохраняет порядок пакетов
+        for processed in executor.map(partial(_apply_chunk, func), chunks):
+            result.extend(processed)
+    return result
+
+def apply_transform(name: str, data: Any, workers: Optional[int] = None,
+                    chunk_size: Optional[int] = None, min_seconds: float = PARALLEL_MIN_SECONDS) -> Any:
+    """Применяет зарегистрированное преобразование к данным товаров"""
+    func = get_transform(name)
+    if not isinstance(data, list):
+        return func(data)
+    return parallel_map(func, data, workers, chunk_size, min_seconds)
+
+def benchmark(name: str, data: List[Any], workers: Optional[int] = None,
+              chunk_size: Optional[int] = None, min_seconds: float = PARALLEL_MIN_SECONDS) -> Dict[str, float]:
+    """Сравнивает последовательный и параллельный прогон преобразования"""
+    func = get_transform(name)
+
+    start = time.perf_counter()
+    serial_result = [func(item) for item in data]
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_result = apply_transform(name, data, workers, chunk_size, min_seconds)
+    parallel_time = time.perf_counter() - start
+
+    if parallel_result != serial_result:
+        raise AssertionError(f"Результаты параллельного и последовательного прогона '{name}' различаются")
+
+    return {
+        'items': len(data),
+        'workers': workers or os.cpu_count() or 1,
+        'serial': serial_time,
+        'parallel': parallel_time,
+        'speedup': serial_time / parallel_time if parallel_time else float('inf'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельная обработка товаров зарегистрированными преобразованиями")
+    parser.add_argument('transform', help="Имя преобразования: kotly, lhw, slug, fixkeys")
+    parser.add_argument('input', nargs='?', default='products.json', help="Входной JSON файл")
+    parser.add_argument('output', nargs='?', help="Выходной JSON файл (по умолчанию <input>_<transform>.json)")
+    parser.add_argument('--workers', type=int, help="Число процессов (по умолчанию число ядер)")
+    parser.add_argument('--chunk-size', type=int, help="Размер пакета (по умолчанию подбирается автоматически)")
+    parser.add_argument('--filter', default='filter.json', help="Файл соответствия ключей для fixkeys")
+    parser.add_argument('--bench', action='store_true', help="Сравнить скорость с последовательным прогоном")
+    parser.add_argument('--scale', type=int, default=1, help="Размножить товары N раз для замера на большом импорте")
+    parser.add_argument('--min-seconds', type=float, default=PARALLEL_MIN_SECONDS,
+                        help="Запускать пул, только если последовательно дольше N секунд (0 - всегда)")
+    args = parser.parse_args()
+
+    if args.transform == 'fixkeys':
+        register_fixkeys(args.filter)
+
+    data = load_json_with_bom_handling(args.input)
+    if data is None:
+        return
+
+    if args.bench:
+        items = data * args.scale if isinstance(data, list) else [data] * args.scale
+        stats = benchmark(args.transform, items, args.workers, args.chunk_size, args.min_seconds)
+        print(f"Товаров: {stats['items']}, процессов: {stats['workers']}")
+        print(f"Последовательно: {stats['serial']:.3f} с")
+        print(f"Параллельно:     {stats['parallel']:.3f} с")
+        print(f"Ускорение:       x{stats['speedup']:.2f}")
+        return
+
+    output_file = args.output or f"{os.path.splitext(args.input)[0]}_{args.transform}.json"
+    print(f"Обработка '{args.transform}'...")
+    result = apply_transform(args.transform, data, args.workers, args.chunk_size, args.min_seconds)
+
+    jsoncodec.dump(result, output_file)
+
+    print(f"Обработка завершена. Результат сохранен в {output_file}")
+
+if __name__ == "__main__":
+    main()
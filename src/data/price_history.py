@@ -0,0 +1,385 @@
+import argparse
+import calendar
+import os
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import jsoncodec
+
+# Виды цен и файлы, из которых они берутся
+KINDS = ('prices', 'actionPrices')
+
+# Строка журнала изменений: время (unix, UTC), номер id, вид цены, цена
+ROW = struct.Struct('<IIBi')
+
+# Цена удалена из файла (0 - это "цена по запросу", поэтому нужен отдельный маркер)
+REMOVED = -1
+
+# Сигнатуры колоночных файлов: сжатый сегмент и снимок состояния на конец месяца
+SEGMENT_MAGIC = b'PHS1'
+CHECKPOINT_MAGIC = b'PHC1'
+SEGMENT_COLUMNS = ('I', 'I', 'B', 'i')
+CHECKPOINT_COLUMNS = ('I', 'B', 'i')
+
+State = Dict[Tuple[int, int], int]
+
+def month_key(timestamp: int) -> str:
+    """Возвращает месяц сегмента (ГГГГ-ММ) для времени в UTC"""
+    t = time.gmtime(timestamp)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}"
+
+def parse_date(text: str) -> int:
+    """Преобразует дату ГГГГ-ММ-ДД в unix-время начала дня (UTC)"""
+    return calendar.timegm(time.strptime(text, '%Y-%m-%d'))
+
+def format_time(timestamp: int) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.gmtime(timestamp))
+
+def _write_columns(file_path: str, magic: bytes, columns: List[array]) -> None:
+    """Атомарно записывает колоночный файл: сигнатура, число строк, столбцы подряд"""
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<I', len(columns[0])))
+        for column in columns:
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            f.write(column.tobytes())
+    os.replace(tmp_path, file_path)
+
+def _read_columns(file_path: str, magic: bytes, typecodes: Tuple[str, ...]) -> List[array]:
+    """Читает колоночный файл, записанный _write_columns"""
+    with open(file_path, 'rb') as f:
+        if f.read(4) != magic:
+            raise ValueError(f"Неверный формат файла {file_path}")
+        (count,) = struct.unpack('<I', f.read(4))
+        columns = []
+        for typecode in typecodes:
+            column = array(typecode)
+            column.frombytes(f.read(count * column.itemsize))
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns.append(column)
+    return columns
+
+def _apply(state: State, rows: List[Tuple[int, int, int, int]], until: Optional[int] = None) -> None:
+    """Применяет изменения к состоянию (строки отсортированы по времени)"""
+    for timestamp, idx, kind, price in rows:
+        if until is not None and timestamp > until:
+            break
+        if price == REMOVED:
+            state.pop((idx, kind), None)
+        else:
+            state[(idx, kind)] = price
+
+class PriceHistory:
+    """Хранилище истории цен: только изменения, сегменты по месяцам.
+
+    Новые изменения дописываются в журнал месяца (<ГГГГ-ММ>.log, строки
+    фиксированной длины). Сжатие переводит закрытые месяцы в колоночные
+    сегменты (<ГГГГ-ММ>.seg) и сохраняет снимок всех цен на конец месяца
+    (<ГГГГ-ММ>.snap), поэтому состояние на дату восстанавливается от
+    ближайшего снимка без проигрывания всей истории.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.ids_file = os.path.join(directory, 'ids.json')
+        # Последний коммит, импортированный import-git (повторный импорт начинается после него)
+        self.git_file = os.path.join(directory, 'git.json')
+        self.ids: List[str] = []
+        if os.path.exists(self.ids_file):
+            self.ids = jsoncodec.load(self.ids_file)
+        self.index = {product_id: idx for idx, product_id in enumerate(self.ids)}
+
+    def _path(self, month: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{month}.{extension}")
+
+    def _id_index(self, product_id: str) -> int:
+        if product_id not in self.index:
+            self.index[product_id] = len(self.ids)
+            self.ids.append(product_id)
+        return self.index[product_id]
+
+    def _save_ids(self) -> None:
+        tmp_path = self.ids_file + '.tmp'
+        jsoncodec.dump(self.ids, tmp_path)
+        os.replace(tmp_path, self.ids_file)
+
+    def imported_commit(self) -> Optional[str]:
+        if not os.path.exists(self.git_file):
+            return None
+        return jsoncodec.load(self.git_file).get('commit')
+
+    def save_imported_commit(self, commit: str) -> None:
+        tmp_path = self.git_file + '.tmp'
+        jsoncodec.dump({'commit': commit}, tmp_path)
+        os.replace(tmp_path, self.git_file)
+
+    def months(self) -> List[str]:
+        """Месяцы, за которые есть изменения"""
+        months = set()
+        for name in os.listdir(self.directory):
+            month, extension = os.path.splitext(name)
+            if extension in ('.log', '.seg'):
+                months.add(month)
+        return sorted(months)
+
+    def read_month(self, month: str) -> List[Tuple[int, int, int, int]]:
+        """Читает изменения месяца: сжатый сегмент и дописанный после сжатия журнал"""
+        rows = []
+        segment_path = self._path(month, 'seg')
+        if os.path.exists(segment_path):
+            rows.extend(zip(*_read_columns(segment_path, SEGMENT_MAGIC, SEGMENT_COLUMNS)))
+        log_path = self._path(month, 'log')
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                data = f.read()
+            # Недописанная строка в конце (сбой при записи) отбрасывается
+            usable = len(data) - len(data) % ROW.size
+            rows.extend(ROW.iter_unpack(data[:usable]))
+        return rows
+
+    def _load_checkpoint(self, month: str) -> State:
+        ids, kinds, prices = _read_columns(self._path(month, 'snap'), CHECKPOINT_MAGIC, CHECKPOINT_COLUMNS)
+        return {(idx, kind): price for idx, kind, price in zip(ids, kinds, prices)}
+
+    def _is_checkpoint_valid(self, month: str) -> bool:
+        """Снимок актуален, если после сжатия в месяц ничего не дописывали"""
+        return os.path.exists(self._path(month, 'snap')) and not os.path.exists(self._path(month, 'log'))
+
+    def state_at(self, timestamp: int) -> State:
+        """Состояние всех цен на момент timestamp (включительно)"""
+        target = month_key(timestamp)
+        months = [month for month in self.months() if month <= target]
+
+        state: State = {}
+        start = 0
+        for i in range(len(months) - 1, -1, -1):
+            if months[i] < target and self._is_checkpoint_valid(months[i]):
+                state = self._load_checkpoint(months[i])
+                start = i + 1
+                break
+
+        for month in months[start:]:
+            _apply(state, self.read_month(month), until=timestamp)
+        return state
+
+    def last_timestamp(self) -> Optional[int]:
+        months = self.months()
+        if not months:
+            return None
+        rows = self.read_month(months[-1])
+        return max(row[0] for row in rows) if rows else None
+
+    def record(self, price_maps: Dict[str, Dict[str, Any]], timestamp: Optional[int] = None) -> int:
+        """Записывает изменения относительно последнего состояния, возвращает их число.
+
+        price_maps - словарь вида {'prices': {...}, 'actionPrices': {...}}.
+        Время должно быть не раньше последней записи: журнал только дописывается.
+        """
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        last = self.last_timestamp()
+        if last is not None and timestamp < last:
+            raise ValueError(f"Время {format_time(timestamp)} раньше последней записи {format_time(last)}")
+
+        current = self.state_at(timestamp)
+        new_state: State = {}
+        for kind, name in enumerate(KINDS):
+            for product_id, price in (price_maps.get(name) or {}).items():
+                if not isinstance(price, (int, float)) or isinstance(price, bool) or price != int(price):
+                    raise ValueError(f"Цена '{product_id}' должна быть целым числом: {price}")
+                new_state[(self._id_index(product_id), kind)] = int(price)
+
+        changes = [(idx, kind, price) for (idx, kind), price in new_state.items() if current.get((idx, kind)) != price]
+        changes += [(idx, kind, REMOVED) for (idx, kind) in current if (idx, kind) not in new_state]
+        if not changes:
+            return 0
+
+        self._save_ids()
+        with open(self._path(month_key(timestamp), 'log'), 'ab') as f:
+            f.write(b''.join(ROW.pack(timestamp, idx, kind, price) for idx, kind, price in sorted(changes)))
+        return len(changes)
+
+    def compact(self, include_current: bool = False) -> List[str]:
+        """Сжимает журналы закрытых месяцев в колоночные сегменты со снимками.
+
+        Текущий месяц по умолчанию не трогается, так как в него еще дописывают.
+        Возвращает список сжатых месяцев.
+        """
+        current = month_key(int(time.time()))
+        compacted = []
+        state: State = {}
+        for month in self.months():
+            if self._is_checkpoint_valid(month):
+                state = self._load_checkpoint(month)
+                continue
+
+            rows = sorted(self.read_month(month), key=lambda row: row[0])
+            _apply(state, rows)
+            if month == current and not include_current:
+                continue
+
+            _write_columns(self._path(month, 'seg'), SEGMENT_MAGIC, [
+                array(typecode, (row[i] for row in rows)) for i, typecode in enumerate(SEGMENT_COLUMNS)
+            ])
+            keys = sorted(state)
+            _write_columns(self._path(month, 'snap'), CHECKPOINT_MAGIC, [
+                array('I', (idx for idx, _ in keys)),
+                array('B', (kind for _, kind in keys)),
+                array('i', (state[key] for key in keys)),
+            ])
+            log_path = self._path(month, 'log')
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            compacted.append(month)
+        return compacted
+
+    def snapshot(self, timestamp: int) -> Dict[str, Dict[str, int]]:
+        """Цены на момент timestamp в формате prices.json / actionPrices.json"""
+        result: Dict[str, Dict[str, int]] = {name: {} for name in KINDS}
+        for (idx, kind), price in sorted(self.state_at(timestamp).items()):
+            result[KINDS[kind]][self.ids[idx]] = price
+        return result
+
+    def history(self, product_id: str, start: int, end: int) -> List[Tuple[int, str, Optional[int]]]:
+        """Изменения цен товара в интервале [start, end]: (время, вид цены, цена или None если удалена)"""
+        idx = self.index.get(product_id)
+        if idx is None:
+            return []
+        first, last = month_key(start), month_key(end)
+        changes = []
+        for month in self.months():
+            if month < first or month > last:
+                continue
+            for timestamp, row_idx, kind, price in self.read_month(month):
+                if row_idx == idx and start <= timestamp <= end:
+                    changes.append((timestamp, KINDS[kind], None if price == REMOVED else price))
+        return sorted(changes, key=lambda change: change[0])
+
+def load_price_maps(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Загружает текущие prices.json и actionPrices.json"""
+    price_maps = {}
+    for name in KINDS:
+        file_path = os.path.join(directory, f"{name}.json")
+        if os.path.exists(file_path):
+            price_maps[name] = jsoncodec.load(file_path)
+    return price_maps
+
+def import_git_history(history: PriceHistory, directory: str) -> int:
+    """Заполняет историю по коммитам git, изменявшим файлы цен. Возвращает число записанных коммитов.
+
+    Импортируются только коммиты после последнего импортированного (хранится
+    в git.json), поэтому повторный запуск ничего не записывает заново. Если
+    хранилище уже заполнено командой record, коммиты старше его записей
+    пропускаются: журнал только дописывается. Время нового коммита (%ct)
+    может идти не по порядку (rebase, сбитые часы) - такой коммит
+    записывается временем последней записи, чтобы его цены не потерялись.
+    """
+    since = history.imported_commit()
+    revisions = []
+    if since:
+        ancestor = subprocess.run(['git', 'merge-base', '--is-ancestor', since, 'HEAD'],
+                                  cwd=directory, capture_output=True)
+        if ancestor.returncode != 0:
+            raise ValueError(f"Последний импортированный коммит {since[:10]} отсутствует в истории HEAD "
+                             f"(история переписана?). Удалите {history.git_file}, чтобы импортировать заново")
+        revisions = [f"{since}..HEAD"]
+
+    files = [f"{name}.json" for name in KINDS]
+    log = subprocess.run(
+        ['git', 'log', '--reverse', '--format=%H %ct', *revisions, '--', *files],
+        cwd=directory, capture_output=True, text=True, check=True
+    )
+    last = history.last_timestamp()
+    # Без сохраненного коммита записи хранилища (если есть) сделаны командой record
+    started = since is not None or last is None
+    imported = 0
+    skipped = 0
+    for line in log.stdout.splitlines():
+        commit, commit_time = line.split()
+        timestamp = int(commit_time)
+        if last is not None and timestamp <= last and not started:
+            history.save_imported_commit(commit)
+            skipped += 1
+            continue
+        started = True
+        if last is not None and timestamp < last:
+            print(f"⚠️  Коммит {commit[:10]} от {format_time(timestamp)} раньше последней записи "
+                  f"{format_time(last)}, записывается временем {format_time(last)}")
+            timestamp = last
+        price_maps = {}
+        for name in KINDS:
+            shown = subprocess.run(['git', 'show', f"{commit}:./{name}.json"], cwd=directory, capture_output=True)
+            if shown.returncode == 0:
+                price_maps[name] = jsoncodec.loads(shown.stdout)
+        if history.record(price_maps, timestamp):
+            imported += 1
+        history.save_imported_commit(commit)
+        last = timestamp
+    if skipped:
+        print(f"⚠️  Пропущено коммитов старше записей хранилища: {skipped}")
+    return imported
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="История цен: запись изменений, сжатие и запросы")
+    parser.add_argument('--store', default=os.path.join(script_dir, 'price_history'), help="Папка хранилища")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('record', help="Записать изменения текущих prices.json и actionPrices.json")
+    commands.add_parser('import-git', help="Заполнить историю по коммитам git")
+    compact_parser = commands.add_parser('compact', help="Сжать журналы закрытых месяцев")
+    compact_parser.add_argument('--all', action='store_true', help="Сжать и текущий месяц")
+    snapshot_parser = commands.add_parser('snapshot', help="Цены на дату")
+    snapshot_parser.add_argument('date', help="Дата ГГГГ-ММ-ДД (на конец дня)")
+    snapshot_parser.add_argument('--output', help="Папка для prices.json и actionPrices.json")
+    history_parser = commands.add_parser('history', help="Изменения цен товара за период")
+    history_parser.add_argument('id', help="id товара")
+    history_parser.add_argument('--from', dest='date_from', default='1970-01-01', help="Дата начала ГГГГ-ММ-ДД")
+    history_parser.add_argument('--to', dest='date_to', help="Дата конца ГГГГ-ММ-ДД (по умолчанию сегодня)")
+    args = parser.parse_args()
+
+    history = PriceHistory(args.store)
+
+    if args.command == 'record':
+        count = history.record(load_price_maps(script_dir))
+        print(f"Записано изменений: {count}")
+    elif args.command == 'import-git':
+        try:
+            imported = import_git_history(history, script_dir)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Импортировано коммитов с изменениями цен: {imported}")
+    elif args.command == 'compact':
+        compacted = history.compact(include_current=args.all)
+        print(f"Сжато месяцев: {len(compacted)} {', '.join(compacted)}")
+    elif args.command == 'snapshot':
+        # Конец дня включительно
+        snapshot = history.snapshot(parse_date(args.date) + 86399)
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            for name, prices in snapshot.items():
+                jsoncodec.dump(prices, os.path.join(args.output, f"{name}.json"))
+            print(f"Цены на {args.date} сохранены в {args.output}")
+        else:
+            print(jsoncodec.dumps(snapshot))
+    elif args.command == 'history':
+        start = parse_date(args.date_from)
+        end = parse_date(args.date_to) + 86399 if args.date_to else int(time.time())
+        initial = history.snapshot(start - 1)
+        for name in KINDS:
+            if args.id in initial[name]:
+                print(f"{args.date_from}: {name} = {initial[name][args.id]}")
+        for timestamp, name, price in history.history(args.id, start, end):
+            print(f"{format_time(timestamp)}: {name} = {'удалена' if price is None else price}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import os
+import re
+from functools import partial
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+import jsoncodec
+from create_slug import generate_abbreviation
+from parallel import parallel_map
+
+# Расширения сохраненных страниц поставщика
+PAGE_EXTENSIONS = ('.html', '.htm')
+
+# Расширения, по которым ссылка считается ссылкой на полноразмерное изображение
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+
+# Число: целое или дробное с точкой/запятой
+NUMBER_RE = re.compile(r'^-?\d+(?:[.,]\d+)?$')
+
+# Габариты вида "730 x 550 x 310" (латинская/кириллическая x, *, ×)
+DIMENSIONS_RE = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*[xхXХ*×]\s*(\d+(?:[.,]\d+)?)\s*[xхXХ*×]\s*(\d+(?:[.,]\d+)?)\s*(?:мм)?\s*$')
+
+# Габариты, разбитые по запятой: подпись "Габариты, 400 x 700" и значение "730"
+# (та же ошибка, которую исправляет lhw.py)
+SPLIT_LABEL_RE = re.compile(r'^(.*?),\s*[xхXХ*×]?\s*(\d+(?:[.,]\d+)?)\s*[xхXХ*×]\s*(\d+(?:[.,]\d+)?)\s*$')
+
+# Порядок частей габаритов у поставщика - ВxШxГ; подписи переводятся в ключи
+# keys.json (height, width, depth), как и остальные характеристики
+DIMENSION_LABELS = ('Высота', 'Ширина', 'Глубина')
+
+class SupplierPageParser(HTMLParser):
+    """Собирает из страницы товара заголовок, описание, изображения и таблицы характеристик"""
+
+    TEXT_TAGS = ('h1', 'title', 'td', 'th', 'dt', 'dd')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.h1 = ''
+        self.title = ''
+        self.description = ''
+        self.og_image = ''
+        self.images: List[str] = []
+        self.full_images: List[str] = []
+        self.specs: List[Tuple[str, str]] = []
+        self._text_tag: Optional[str] = None
+        self._text: List[str] = []
+        self._row: Optional[List[str]] = None
+        self._row_tags: List[str] = []
+        self._dt: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            name = (attrs.get('name') or attrs.get('property') or '').lower()
+            if name == 'description' and not self.description:
+                self.description = (attrs.get('content') or '').strip()
+            elif name == 'og:image' and not self.og_image:
+                self.og_image = (attrs.get('content') or '').strip()
+        elif tag == 'img':
+            src = attrs.get('data-src') or attrs.get('src') or ''
+            if src and not src.startswith('data:') and not src.lower().endswith(('.svg', '.gif')):
+                self.images.append(src)
+        elif tag == 'a':
+            href = attrs.get('href') or ''
+            if href.lower().split('?')[0].endswith(IMAGE_EXTENSIONS):
+                self.full_images.append(href)
+        elif tag == 'tr':
+            self._row = []
+            self._row_tags = []
+        elif tag in self.TEXT_TAGS:
+            self._text_tag = tag
+            self._text = []
+
+    def handle_data(self, data):
+        if self._text_tag:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'tr':
+            # Строка из одних <th> - заголовок таблицы ("Характеристика | Значение"), а не характеристика
+            is_header = all(cell_tag == 'th' for cell_tag in self._row_tags)
+            if self._row and len(self._row) >= 2 and self._row[0] and not is_header:
+                self.specs.append((self._row[0], self._row[1]))
+            self._row = None
+        elif tag == self._text_tag:
+            text = ' '.join(''.join(self._text).split())
+            self._text_tag = None
+            if tag == 'h1' and not self.h1:
+                self.h1 = text
+            elif tag == 'title' and not self.title:
+                self.title = text
+            elif tag in ('td', 'th') and self._row is not None:
+                self._row.append(text)
+                self._row_tags.append(tag)
+            elif tag == 'dt':
+                self._dt = text
+            elif tag == 'dd' and self._dt:
+                self.specs.append((self._dt, text))
+                self._dt = None
+
+def read_page(file_path: str) -> str:
+    """Читает сохраненную страницу с учетом кодировки из meta charset (часто windows-1251)"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    match = re.search(rb'charset=["\']?([\w-]+)', raw[:4096], re.IGNORECASE)
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return raw.decode(encoding, errors='replace')
+    except LookupError:
+        return raw.decode('utf-8', errors='replace')
+
+def build_label_mapping(keys: Dict[str, str]) -> Dict[str, str]:
+    """Строит соответствие "подпись характеристики" -> ключ из keys.json (без учета регистра)"""
+    return {normalize_label(label): key for key, label in keys.items()}
+
+def normalize_label(label: str) -> str:
+    """Нормализует подпись из таблицы: пробелы, двоеточие в конце, регистр"""
+    return ' '.join(label.split()).rstrip(':').strip().lower()
+
+def convert_value(value: str) -> Any:
+    """Преобразует строковое значение в число, если это число"""
+    value = value.strip()
+    if not NUMBER_RE.match(value):
+        return value
+    if '.' in value or ',' in value:
+        return float(value.replace(',', '.'))
+    return int(value)
+
+def join_split_dimensions(label: str, value: str) -> Tuple[str, str]:
+    """Склеивает габариты, разбитые по запятой: ("Габариты, 400 x 700", "730") -> ("Габариты", "730 x 400 x 700")"""
+    match = SPLIT_LABEL_RE.match(label)
+    if not match or not NUMBER_RE.match(value.strip()):
+        return label, value
+    return match.group(1).strip(), f"{value.strip()} x {match.group(2)} x {match.group(3)}"
+
+def split_dimensions(value: str, label_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Раскладывает габариты "ВxШxГ" на ключи высоты, ширины и глубины из keys.json"""
+    match = DIMENSIONS_RE.match(value)
+    if not match:
+        return None
+    return {
+        label_mapping.get(normalize_label(label), label): convert_value(part)
+        for label, part in zip(DIMENSION_LABELS, match.groups())
+    }
+
+def image_path(url: str, image_root: str, old_id: str) -> str:
+    """Путь изображения в нашей структуре: /<папка>/<старый_id>/<имя_файла> (как в kotly.py)"""
+    filename = url.split('?')[0].rstrip('/').split('/')[-1]
+    return f"/{image_root}/{old_id}/{filename}"
+
+def parse_page_file(file_path: str, label_mapping: Dict[str, str], image_root: str,
+                    categories: List[str]) -> Optional[Dict[str, Any]]:
+    """Разбирает одну сохраненную страницу товара в запись products.json.
+
+    Старый id берется из имени файла и используется как slug и папка
+    изображений; новый id строится из slug, как в create_slug.py.
+    """
+    try:
+        parser = SupplierPageParser()
+        parser.feed(read_page(file_path))
+        parser.close()
+    except Exception as e:
+        print(f"❌ Ошибка разбора {file_path}: {e}")
+        return None
+
+    title = parser.h1 or parser.title
+    if not title:
+        print(f"⚠️  Пропущена страница без заголовка: {file_path}")
+        return None
+
+    old_id = os.path.splitext(os.path.basename(file_path))[0]
+    record: Dict[str, Any] = {}
+    dimensions: Dict[str, Any] = {}
+    for label, value in parser.specs:
+        label, value = join_split_dimensions(label, value)
+        key = label_mapping.get(normalize_label(label), ' '.join(label.split()).rstrip(':'))
+        if not value:
+            continue
+        parts = split_dimensions(value, label_mapping)
+        if parts:
+            record[key] = 'x'.join(DIMENSIONS_RE.match(value).groups())
+            for part_key, part in parts.items():
+                dimensions.setdefault(part_key, part)
+            continue
+        record[key] = convert_value(value)
+
+    # Отдельные строки "Высота", "Ширина", "Глубина" точнее габаритов и не перезаписываются
+    for part_key, part in dimensions.items():
+        record.setdefault(part_key, part)
+
+    if parser.description:
+        record['desc'] = parser.description
+    record['title'] = title
+    record['slug'] = old_id
+    record['id'] = generate_abbreviation(old_id)
+
+    # Основное изображение и полноразмерное (full_img сразу складывается в img, как в kotly.py)
+    main_image = parser.og_image or (parser.images[0] if parser.images else '')
+    images = []
+    if main_image:
+        images.append(image_path(main_image, image_root, old_id))
+    if parser.full_images:
+        full_image = image_path(parser.full_images[0], image_root, old_id)
+        if full_image not in images:
+            images.append(full_image)
+    if images:
+        record['img'] = images
+    record['categories'] = list(categories)
+    return record
+
+def find_pages(input_dir: str) -> List[str]:
+    """Находит сохраненные страницы в папке (рекурсивно), в стабильном порядке"""
+    pages = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if name.lower().endswith(PAGE_EXTENSIONS):
+                pages.append(os.path.join(root, name))
+    return sorted(pages)
+
+def scrape_directory(input_dir: str, keys: Dict[str, str], image_root: str, categories: List[str],
+                     workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Разбирает все страницы папки в пуле процессов и возвращает записи в порядке файлов"""
+    pages = find_pages(input_dir)
+    parse = partial(parse_page_file, label_mapping=build_label_mapping(keys),
+                    image_root=image_root, categories=categories)
+    return [record for record in parallel_map(parse, pages, workers) if record is not None]
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Разбор сохраненных страниц поставщика в записи products.json")
+    parser.add_argument('input_dir', help="Папка с сохраненными HTML страницами товаров")
+    parser.add_argument('output', nargs='?', default='products_scraped.json', help="Выходной JSON файл")
+    parser.add_argument('--keys', default=os.path.join(script_dir, 'keys.json'), help="Файл соответствия ключей")
+    parser.add_argument('--image-root', default='kotly-nastennye', help="Папка изображений (/<папка>/<старый_id>/...)")
+    parser.add_argument('--categories', default='gas-boilers', help="Категории товаров через запятую")
+    parser.add_argument('--workers', type=int, help="Число процессов (по умолчанию число ядер)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Папка {args.input_dir} не найдена")
+        return
+
+    keys = jsoncodec.load(args.keys)
+    categories = [cat.strip() for cat in args.categories.split(',') if cat.strip()]
+
+    print(f"Разбор страниц из {args.input_dir}...")
+    records = scrape_directory(args.input_dir, keys, args.image_root, categories, args.workers)
+
+    jsoncodec.dump(records, args.output)
+
+    print(f"Обработано товаров: {len(records)}. Результат сохранен в {args.output}")
+
+if __name__ == "__main__":
+    main()
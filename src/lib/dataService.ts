@@ -1,10 +1,11 @@
 // src/lib/dataService.ts
 'use server';
 
-import { readFileSync } from 'fs';
+import { createHash } from 'crypto';
+import { existsSync, readFileSync } from 'fs';
 import path from 'path';
 import { marked } from 'marked';
-import type { Product, Categories, Brand, Prices, FilterKeys, AutoFilterConfig, ActiveFilters, Category } from '@/types/data';
+import type { Product, Categories, Brand, Prices, FilterKeys, AutoFilterConfig, ActiveFilters, Category, CategoryPage, CategoryIndex } from '@/types/data';
 import {FilterService} from './filterService';
 import fs from 'fs/promises';
 
@@ -14,13 +15,53 @@ function loadJSON<T extends object>(filename: string): T {
 	const filePath = path.join(dataPath, `${filename}.json`);
 	try {
 		const fileContents = readFileSync(filePath, 'utf8');
-		return JSON.parse(fileContents) as T;
+		// BOM допускается, как и в jsoncodec.py
+		return JSON.parse(fileContents.replace(/^\uFEFF/, '')) as T;
 	} catch (error) {
 		console.error(`Error loading ${filename}:`, error);
 		return {} as T;
 	}
 }
 
+// Необязательные файлы сборки (например filterConfig.json): отсутствие файла - не ошибка
+function loadOptionalJSON<T extends object>(filename: string): T | null {
+	const filePath = path.join(dataPath, `${filename}.json`);
+	if (!existsSync(filePath)) return null;
+	return loadJSON<T>(filename);
+}
+
+// SHA-256 исходного файла данных, как file_hash в catalog_stats.py ('' если файла нет)
+function fileHash(filename: string): string {
+	try {
+		return createHash('sha256').update(readFileSync(path.join(dataPath, `${filename}.json`))).digest('hex');
+	} catch {
+		return '';
+	}
+}
+
+// Файл сборки актуален, если хеши исходных файлов (блок sources) совпадают с текущими
+function isFresh(sources?: Record<string, string>): boolean {
+	return !!sources && Object.entries(sources).every(([filename, hash]) => fileHash(filename) === hash);
+}
+
+// Предрасчитанные фильтры из catalog_stats.py --filters filterConfig.json.
+// Файл устарел, если после его сборки изменились products.json, categories.json или keys.json
+function loadFilterConfigs(): Record<string, AutoFilterConfig> | null {
+	const precomputed = loadOptionalJSON<{
+		sources?: Record<string, string>;
+		categories?: Record<string, AutoFilterConfig>;
+	}>('filterConfig');
+	if (!precomputed?.categories || !isFresh(precomputed.sources)) return null;
+	return precomputed.categories;
+}
+
+// Индекс срезов категории из category_pages.py; null, если срезы не собраны или
+// после сборки изменились products.json, prices.json, actionPrices.json или categories.json
+function loadCategoryIndex(categorySlug: string): CategoryIndex | null {
+	const index = loadOptionalJSON<CategoryIndex>(path.join('pages', categorySlug, 'index'));
+	if (!index?.orders || !isFresh(index.sources)) return null;
+	return index;
+}
 
 // Async loadMarkdown
 export async function loadMarkdown(filePath: string): Promise<string> {
@@ -77,6 +118,75 @@ function productInCategory(product: Product, categorySlug: string): boolean {
 		: product.categories === categorySlug;
 }
 
+// Размер страницы категории, как PAGE_SIZE в category_pages.py
+const CATEGORY_PAGE_SIZE = 24;
+
+// Порядки сортировки: поле товара и направление, как SORT_FIELDS в category_pages.py
+const CATEGORY_SORTS: Record<string, [string, boolean]> = {
+	'price-asc': ['price', false],
+	'price-desc': ['price', true],
+	'name-asc': ['title', false],
+	'name-desc': ['title', true],
+	'power-asc': ['power_kw', false],
+	'power-desc': ['power_kw', true],
+	'area-asc': ['area_max', false],
+	'area-desc': ['area_max', true],
+};
+
+function isCategorySort(sortKey: string): boolean {
+	return sortKey === 'default' || sortKey in CATEGORY_SORTS;
+}
+
+// Товары категории с подмешанными ценами, как page_record в category_pages.py
+function getCategoryRecords(categorySlug: string): Product[] {
+	const prices = loadJSON<Prices>('prices');
+	const actionPrices = loadJSON<Prices>('actionPrices');
+	return loadJSON<Product[]>('products')
+		.filter(p => productInCategory(p, categorySlug))
+		.map(p => {
+			const record: Product = { ...p };
+			if (p.id in prices) record.price = prices[p.id];
+			if (p.id in actionPrices) record.actionPrice = actionPrices[p.id];
+			return record;
+		});
+}
+
+// Сортировка по тем же правилам, что в category_pages.py: цена как в корзине
+// (акционная, затем обычная), товары без значения в конце, порядок каталога при равенстве
+function sortCategoryRecords(records: Product[], sortKey: string): Product[] {
+	const sort = CATEGORY_SORTS[sortKey];
+	if (!sort) return records;
+	const [field, descending] = sort;
+	const valueOf = (record: Product): number | string | null => {
+		if (field === 'title') return String(record.title ?? '').toLowerCase().replace(/ё/g, 'е');
+		if (field === 'price') return (record.actionPrice as number) || (record.price as number) || null;
+		const value = record[field];
+		return typeof value === 'number' ? value : null;
+	};
+	const withValue = records.filter(record => valueOf(record) !== null);
+	const withoutValue = records.filter(record => valueOf(record) === null);
+	withValue.sort((a, b) => {
+		const x = valueOf(a)!;
+		const y = valueOf(b)!;
+		const cmp = x < y ? -1 : x > y ? 1 : 0;
+		return descending ? -cmp : cmp;
+	});
+	return [...withValue, ...withoutValue];
+}
+
+// Полный порядок id товаров категории для сортировки: из pages/<категория>/index.json или на лету
+function getCategoryOrder(categorySlug: string, sortKey: string): string[] {
+	const categories = loadJSON<Categories>('categories');
+	if (!categories[categorySlug]) {
+		return [];
+	}
+	const index = loadCategoryIndex(categorySlug);
+	if (index?.orders[sortKey]) {
+		return index.orders[sortKey];
+	}
+	return sortCategoryRecords(getCategoryRecords(categorySlug), sortKey).map(p => p.id);
+}
+
 export const dataService = {
 	getCategories: (): Categories => loadJSON<Categories>('categories'),
 	getProducts: (): Product[] => loadJSON<Product[]>('products'),
@@ -94,6 +204,34 @@ export const dataService = {
 		const products = loadJSON<Product[]>('products');
 		return products.filter(p => productInCategory(p, categorySlug));
 	},
+	// Готовая отсортированная страница категории из category_pages.py (null, если не собрана или устарела)
+	getCategoryPage: (categorySlug: string, sortKey: string = 'default', page: number = 1): CategoryPage | null => {
+		const categories = loadJSON<Categories>('categories');
+		if (!categories[categorySlug] || !/^[a-z-]+$/.test(sortKey) || !Number.isInteger(page) || page < 1) {
+			return null;
+		}
+		if (!loadCategoryIndex(categorySlug)) {
+			return null;
+		}
+		return loadOptionalJSON<CategoryPage>(path.join('pages', categorySlug, sortKey, String(page)));
+	},
+	// Страница категории, посчитанная на лету, если срезы не собраны или устарели (null для неверной сортировки или страницы)
+	buildCategoryPage: (categorySlug: string, sortKey: string = 'default', page: number = 1): CategoryPage | null => {
+		if (!isCategorySort(sortKey) || !Number.isInteger(page) || page < 1) {
+			return null;
+		}
+		const records = sortCategoryRecords(getCategoryRecords(categorySlug), sortKey);
+		const pages = Math.max(1, Math.ceil(records.length / CATEGORY_PAGE_SIZE));
+		if (page > pages) {
+			return null;
+		}
+		return {
+			page,
+			pages,
+			total: records.length,
+			products: records.slice((page - 1) * CATEGORY_PAGE_SIZE, page * CATEGORY_PAGE_SIZE),
+		};
+	},
 	getFilterConfigForCategory: (categorySlug: string): AutoFilterConfig => {
 		const categories = loadJSON<Categories>('categories');
 		const category: Category | undefined = categories[categorySlug];
@@ -101,8 +239,24 @@ export const dataService = {
 			console.warn(`Category ${categorySlug} not found`);
 			return {};
 		}
+		const precomputed = loadFilterConfigs()?.[categorySlug];
+		// catalog_stats.py не сохраняет values у строковых ключей с большим числом
+		// различных значений (больше EXACT_LIMIT) - такие ключи досчитываются на лету
+		const incomplete = precomputed
+			? Object.keys(precomputed).filter(key => precomputed[key].type !== 'range' && !precomputed[key].values)
+			: [];
+		if (precomputed && incomplete.length === 0) {
+			return precomputed;
+		}
 		const products = loadJSON<Product[]>('products');
 		const categoryProducts = products.filter(p => productInCategory(p, categorySlug));
+		if (precomputed) {
+			const config: AutoFilterConfig = { ...precomputed };
+			incomplete.forEach(key => {
+				config[key] = { ...FilterService.autoDetectFilterType(categoryProducts, key), title: precomputed[key].title };
+			});
+			return config;
+		}
 		if (categoryProducts.length === 0) {
 			console.warn(`No products found for category ${categorySlug}`);
 			return {};
@@ -111,12 +265,19 @@ export const dataService = {
 		const excludeKeys = category.exclude_keys ?? [];
 		return FilterService.generateFilterConfig(categoryProducts, filterKeys, excludeKeys);
 	},
-	getFilteredProducts: (categorySlug: string, activeFilters: ActiveFilters): Product[] => {
+	getFilteredProducts: (categorySlug: string, activeFilters: ActiveFilters, sortKey: string = 'default'): Product[] => {
 		const products = loadJSON<Product[]>('products');
 		const categoryProducts = products.filter(p => productInCategory(p, categorySlug));
 		if (categoryProducts.length === 0 || Object.keys(activeFilters).length === 0) {
 			return categoryProducts;
 		}
-		return FilterService.filterProducts(categoryProducts, activeFilters);
+		const filtered = FilterService.filterProducts(categoryProducts, activeFilters);
+		if (sortKey === 'default' || !isCategorySort(sortKey)) {
+			return filtered;
+		}
+		// Результат фильтрации упорядочивается по полному порядку сортировки (срезы или на лету)
+		const order = getCategoryOrder(categorySlug, sortKey);
+		const position = new Map(order.map((id, index) => [id, index]));
+		return filtered.sort((a, b) => (position.get(a.id) ?? order.length) - (position.get(b.id) ?? order.length));
 	}
 };
\ No newline at end of file
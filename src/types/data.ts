@@ -43,6 +43,24 @@ export interface Prices {
   [key: string]: number;
 }
 
+// Срез страницы категории из category_pages.py
+export interface CategoryPage {
+  page: number;
+  pages: number;
+  total: number;
+  products: Product[];
+}
+
+// Индекс категории из category_pages.py: порядки id товаров для каждой сортировки
+export interface CategoryIndex {
+  total: number;
+  page_size: number;
+  pages: number;
+  orders: Record<string, string[]>;
+  // Хеши исходных файлов на момент сборки (products, prices, actionPrices, categories)
+  sources?: Record<string, string>;
+}
+
 export interface FilterKeys {
   [key: string]: string;
 }